@@ -2,13 +2,92 @@
 Test script to process all sample claims and display results.
 """
 
-import json
+import math
+import os
+import shelve
+import sys
+from multiprocessing import Pool
 from pathlib import Path
-from claims_processor import process_claim
+from typing import Any, Dict, List, Optional
+import claims_processor
+from claims_processor import (
+    determine_route, extract_fields_batch, extract_fields_from_text,
+    identify_missing_fields, process_claim, to_json,
+)
 
 
-def test_all_claims():
-    """Process all sample claims and print results."""
+# On-disk cache of results for unchanged claim files
+_CACHE_FILE = ".claims_cache"
+
+# Editing the processor invalidates every cached result
+_PROCESSOR_MTIME = Path(claims_processor.__file__).stat().st_mtime_ns
+
+
+def _cache_key(claim_file: Path) -> str:
+    """Cache key that changes whenever the claim file or the processor changes."""
+    stat = claim_file.stat()
+    return f"{claim_file.resolve()}:{stat.st_mtime_ns}:{stat.st_size}:{_PROCESSOR_MTIME}"
+
+
+def _process_file(claim_file: Path) -> tuple[Path, Optional[Dict[str, Any]], str]:
+    """
+    Worker: process one claim file, in a child process for larger batches.
+    Returns (claim file, result or None on error, printable output) tuple.
+    """
+    try:
+        result = process_claim(str(claim_file))
+        return claim_file, result, to_json(result)
+    except Exception as e:
+        return claim_file, None, f"Error processing {claim_file.name}: {str(e)}"
+
+
+def _process_files(claim_files: List[Path]) -> List[tuple[Path, Optional[Dict[str, Any]], str]]:
+    """
+    Process claim files in file order, across all cores for larger batches.
+    Returns a (claim file, result or None on error, printable output) tuple per file.
+    """
+    cpu_count = os.cpu_count() or 1
+    # Starting workers costs more than a handful of claims takes to process
+    if len(claim_files) < 2 * cpu_count:
+        return [_process_file(claim_file) for claim_file in claim_files]
+    # About four tasks per worker, so the work still spreads out evenly
+    chunksize = max(1, len(claim_files) // (cpu_count * 4))
+    with Pool() as pool:
+        return list(pool.imap(_process_file, claim_files, chunksize=chunksize))
+
+
+def _process_files_cached(claim_files: List[Path]) -> Dict[Path, str]:
+    """
+    Process claim files, reusing results of unchanged files from the on-disk cache.
+    Returns printable output keyed by claim file.
+    """
+    with shelve.open(_CACHE_FILE) as cache:
+        keys = {claim_file: _cache_key(claim_file) for claim_file in claim_files}
+        outputs = {}
+        
+        # Failed claims are not cached and are retried next run
+        misses = [claim_file for claim_file in claim_files if keys[claim_file] not in cache]
+        for claim_file, result, output in _process_files(misses):
+            if result is not None:
+                cache[keys[claim_file]] = result
+            outputs[claim_file] = output
+        for claim_file in claim_files:
+            if claim_file not in outputs:
+                outputs[claim_file] = to_json(cache[keys[claim_file]])
+        
+        # Drop entries for old file versions or an edited processor
+        for key in set(cache.keys()).difference(keys.values()):
+            del cache[key]
+    
+    return outputs
+
+
+def test_all_claims(use_cache: bool = False):
+    """
+    Process all sample claims and print results.
+    With use_cache, results of unchanged files are reused from the on-disk
+    cache instead of being processed again (opt-in, so tests always run).
+    """
     sample_dir = Path("sample_claims")
     
     if not sample_dir.exists():
@@ -25,20 +104,154 @@ def test_all_claims():
     print("INSURANCE CLAIMS PROCESSING PIPELINE - TEST RESULTS")
     print("=" * 80)
     
+    # Claims are independent, so larger batches are processed across all cores
+    if use_cache:
+        outputs = _process_files_cached(claim_files)
+    else:
+        outputs = {claim_file: output for claim_file, _, output in _process_files(claim_files)}
+    
+    # Report in file order; each claim's block is written with a single call
+    separator = "-" * 80
     for claim_file in claim_files:
-        print(f"\n\nProcessing: {claim_file.name}")
-        print("-" * 80)
-        
-        try:
-            result = process_claim(str(claim_file))
-            print(json.dumps(result, indent=2))
-        except Exception as e:
-            print(f"Error processing {claim_file.name}: {str(e)}")
+        sys.stdout.write(f"\n\nProcessing: {claim_file.name}\n{separator}\n{outputs[claim_file]}\n")
     
     print("\n" + "=" * 80)
     print("Processing complete")
     print("=" * 80)
 
 
+def test_first_occurrence_of_inline_label_wins():
+    """A label later on a line is still found before a later 'Label:' line."""
+    text = (
+        "Claimant: John Smith Contact: (555) 111-2222\n"
+        "Claim Type: Property Damage\n"
+        "Contact: (555) 999-0000\n"
+    )
+    assert extract_fields_from_text(text)["contact_details"] == "(555) 111-2222"
+
+
+def test_value_on_following_line_wins_over_later_label():
+    """A value that starts on the next line belongs to the first label."""
+    text = "Third Party:\nJane Doe\nThird Party: Someone Else\n"
+    assert extract_fields_from_text(text)["third_party"] == "Jane Doe"
+
+
+def test_label_without_colon():
+    """Labels may be separated from their value by whitespace only."""
+    text = "Initial Estimate $8,500.00\nInitial Estimate: $1.00\n"
+    assert extract_fields_from_text(text)["initial_estimate"] == 8500.0
+
+
+def test_unicode_whitespace_is_stripped():
+    """Non-ASCII whitespace around a value is removed like ASCII spaces."""
+    fields = extract_fields_from_text(
+        "Location:\u00a0123 Main St\nContact:\u2003(555) 123-4567\u2003\n"
+    )
+    assert fields["incident_location"] == "123 Main St"
+    assert fields["contact_details"] == "(555) 123-4567"
+
+
+def test_multi_line_description_keeps_continuation_lines():
+    """Continuation lines are kept up to the next 'Label:' line."""
+    text = (
+        "Incident Description:\n"
+        "Vehicle was rear-ended at a light.\n"
+        "Damage to bumper and trunk\n"
+        "Claimant: John Smith\n"
+    )
+    fields = extract_fields_from_text(text)
+    assert fields["incident_description"] == (
+        "Vehicle was rear-ended at a light.\nDamage to bumper and trunk"
+    )
+    assert fields["claimant"] == "John Smith"
+
+
+def test_description_ends_at_blank_line():
+    """A blank line ends the description even without a following label."""
+    text = "Description: First line\nSecond line\n\nUnrelated trailing note\n"
+    assert extract_fields_from_text(text)["incident_description"] == "First line\nSecond line"
+
+
+def test_description_on_label_line_may_contain_colon():
+    """Body text on the Description label's own line is never read as a label."""
+    text = "Description: Note: vehicle was parked\nEstimated Damage: $100.00\n"
+    fields = extract_fields_from_text(text)
+    assert fields["incident_description"] == "Note: vehicle was parked"
+    assert fields["estimated_damage"] == 100.0
+
+
+def test_description_ends_at_field_label_without_colon():
+    """A field label without a colon still ends the description."""
+    text = "Incident Description: Rear-ended at a light.\nEstimated Damage $8,500.00\n"
+    fields = extract_fields_from_text(text)
+    assert fields["incident_description"] == "Rear-ended at a light."
+    assert fields["estimated_damage"] == 8500.0
+
+def test_empty_description_does_not_swallow_next_field():
+    """An empty description leaves the following label to its own field."""
+    text = (
+        "Policy Number: POL-2024-000001\n"
+        "Policyholder Name: John Smith\n"
+        "Incident Date: 03/15/2024\n"
+        "Incident Description:\n"
+        "\n"
+        "Estimated Damage: $8,500.00\n"
+        "Claim Type: Property Damage\n"
+    )
+    fields = extract_fields_from_text(text)
+    assert fields["incident_description"] == ""
+    assert fields["estimated_damage"] == 8500.0
+    missing = identify_missing_fields(fields)
+    assert missing == []
+    assert determine_route(fields, missing)[0] == "Fast-track"
+
+
+def test_blank_location_does_not_swallow_description():
+    """A blank Location line still lets the description below it be found."""
+    text = Path("sample_claims/claim_fraud_flag.txt").read_text()
+    text = text.replace(
+        "Location: Remote parking lot, 789 Industrial Blvd, Detroit, MI", "Location:"
+    )
+    fields = extract_fields_from_text(text)
+    assert "inconsistent" in fields["incident_description"]
+    missing = identify_missing_fields(fields)
+    assert determine_route(fields, missing)[0] == "Investigation Flag"
+
+
+def test_blank_asset_id_does_not_swallow_estimated_damage():
+    """A blank Asset ID line still lets the Estimated Damage below it be found."""
+    text = "Asset ID:\nEstimated Damage: $8,500.00\nClaim Type: Property Damage\n"
+    fields = extract_fields_from_text(text)
+    assert fields["estimated_damage"] == 8500.0
+    assert fields["claim_type"] == "Property Damage"
+
+def test_extract_fields_batch_columns():
+    """Columns stay row-aligned with the input files; missing values are NaN/None."""
+    paths = ["sample_claims/claim_fasttrack.txt", "sample_claims/claim_missing_fields.txt"]
+    columns = extract_fields_batch(paths)
+    
+    assert all(len(column) == len(paths) for column in columns.values())
+    assert columns["policy_number"] == ["POL-2024-001234", "POL-2024-005678"]
+    assert list(columns["estimated_damage"]) == [8500.0, 15000.0]
+    
+    # Row 1 has no Initial Estimate or Claim Type line
+    assert columns["initial_estimate"][0] == 8500.0
+    assert math.isnan(columns["initial_estimate"][1])
+    assert columns["claim_type"] == ["Property Damage", None]
+
+
+def test_to_json_matches_stdlib_on_sample_claims():
+    """The orjson and standard library paths format the sample claims identically."""
+    if claims_processor.orjson is None:
+        return
+    results = [process_claim(str(path)) for path in sorted(Path("sample_claims").glob("*.txt"))]
+    fast = [to_json(result) for result in results]
+    orjson, claims_processor.orjson = claims_processor.orjson, None
+    try:
+        assert fast == [to_json(result) for result in results]
+    finally:
+        claims_processor.orjson = orjson
+
 if __name__ == "__main__":
-    test_all_claims()
+    # Pass --cache to reuse results of unchanged claim files between runs
+    test_all_claims(use_cache="--cache" in sys.argv[1:])